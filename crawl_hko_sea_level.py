@@ -1,7 +1,15 @@
 import requests
 import json
+try:
+    import orjson  # C-level JSON parser, much faster on large feeds
+except ImportError:
+    orjson = None
+import glob
+import os
+import numpy as np
 import pandas as pd
 from datetime import datetime
+from email.utils import formatdate
 
 def crawl_hko_sea_level_data():
     """
@@ -21,58 +29,73 @@ def crawl_hko_sea_level_data():
             'Referer': 'https://www.hko.gov.hk/en/cis/yearlyTide.htm'
         }
         
+        # Pooled session with compressed transfer
+        session = requests.Session()
+        session.headers.update({'Accept-Encoding': 'gzip, deflate', **headers})
+
+        # If we already hold a local copy, ask the server to skip the body
+        # when nothing has changed since that download
+        local_files = glob.glob("HKO_QUB_SeaLevel_Data_*.csv")
+        latest_local = max(local_files, key=os.path.getmtime) if local_files else None
+        if latest_local:
+            mtime = os.path.getmtime(latest_local)
+            session.headers['If-Modified-Since'] = formatdate(mtime, usegmt=True)
+
         print(f"Fetching data from: {xml_url}")
-        response = requests.get(xml_url, headers=headers)
+        response = session.get(xml_url, stream=True, timeout=15)
         response.raise_for_status()
-        
-        # Parse JSON data
-        data = response.json()
+
+        if response.status_code == 304:
+            print(f"✓ Server data unchanged, reusing local file: {latest_local}")
+            return pd.read_csv(latest_local)
+
+        # Parse JSON data straight from the raw bytes
+        if orjson is not None:
+            data = orjson.loads(response.content)
+        else:
+            data = json.loads(response.content)
         print(f"✓ Successfully retrieved data (Status: {response.status_code})")
-        
+
         # Extract station data
         stations = data['tide']['data']
         print(f"✓ Found {len(stations)} stations in total")
-        
-        # Find QUB station data
-        qub_data = None
-        for station in stations:
-            if station.get('code') == 'QUB':
-                qub_data = station
-                break
-        
+
+        # Index stations by code for O(1) lookup
+        by_code = {station.get('code'): station for station in stations}
+        qub_data = by_code.get('QUB')
+
         if not qub_data:
             print("✗ QUB station data not found!")
             return None
         
         print(f"✓ Found QUB station data with {len(qub_data['yearData'])} years")
         
-        # Process the data
-        processed_data = []
-        
-        for year_record in qub_data['yearData']:
-            # year_record format: [year, mean_sea_level, mean_higher_high_water, 
-            #                      mean_lower_high_water, mean_higher_low_water, mean_lower_low_water]
-            year = year_record[0]
-            mean_sea_level = year_record[1] if year_record[1] != '***' else None
-            mean_higher_high_water = year_record[2] if year_record[2] != '***' else None
-            mean_lower_high_water = year_record[3] if year_record[3] != '***' else None
-            mean_higher_low_water = year_record[4] if year_record[4] != '***' else None
-            mean_lower_low_water = year_record[5] if year_record[5] != '***' else None
-            
-            processed_data.append({
-                'Year': int(year),
-                'Mean_Sea_Level_m': float(mean_sea_level) if mean_sea_level else None,
-                'Mean_Higher_High_Water_m': float(mean_higher_high_water) if mean_higher_high_water else None,
-                'Mean_Lower_High_Water_m': float(mean_lower_high_water) if mean_lower_high_water else None,
-                'Mean_Higher_Low_Water_m': float(mean_higher_low_water) if mean_higher_low_water else None,
-                'Mean_Lower_Low_Water_m': float(mean_lower_low_water) if mean_lower_low_water else None,
-            })
-        
-        # Create DataFrame
-        df = pd.DataFrame(processed_data)
-        
-        # Sort by year
-        df = df.sort_values('Year')
+        # Process the data column-by-column instead of row-by-row
+        # yearData row format: [year, mean_sea_level, mean_higher_high_water,
+        #                       mean_lower_high_water, mean_higher_low_water, mean_lower_low_water]
+        arr = np.array(qub_data['yearData'], dtype=object)
+
+        def parse_metric(col):
+            # '***' marks missing measurements in the HKO feed
+            # float32 easily covers sea levels in [0, 10] m at mm precision
+            return np.where(col == '***', np.nan, col).astype(np.float32)
+
+        # Sort the raw rows by year up front (the feed is normally already
+        # ordered, so the stable argsort is a no-op pass)
+        years_col = arr[:, 0].astype(np.int64)
+        order = np.argsort(years_col, kind='stable')
+        arr = arr[order]
+
+        # Create DataFrame in one call from typed columns, already sorted
+        # (int16 comfortably holds calendar years)
+        df = pd.DataFrame({
+            'Year': years_col[order].astype(np.int16),
+            'Mean_Sea_Level_m': parse_metric(arr[:, 1]),
+            'Mean_Higher_High_Water_m': parse_metric(arr[:, 2]),
+            'Mean_Lower_High_Water_m': parse_metric(arr[:, 3]),
+            'Mean_Higher_Low_Water_m': parse_metric(arr[:, 4]),
+            'Mean_Lower_Low_Water_m': parse_metric(arr[:, 5]),
+        })
         
         print(f"✓ Processed {len(df)} records from {df['Year'].min()} to {df['Year'].max()}")
         
@@ -101,6 +124,14 @@ def crawl_hko_sea_level_data():
         
         df.to_csv(csv_filename, index=False, encoding='utf-8')
         print(f"\n✓ Data saved to: {csv_filename}")
+
+        # Also cache as Parquet so downstream loads skip CSV parsing
+        parquet_filename = csv_filename.replace('.csv', '.parquet')
+        try:
+            df.to_parquet(parquet_filename, index=False)
+            print(f"✓ Parquet cache saved to: {parquet_filename}")
+        except ImportError:
+            print("! pyarrow not installed, skipping Parquet cache")
         
         # Also save a simplified version with just the main sea level data
         simple_df = df[['Year', 'Mean_Sea_Level_m']].copy()
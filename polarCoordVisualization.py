@@ -2,49 +2,69 @@ import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import matplotlib.animation as animation
-from matplotlib.patches import Circle
 
 # Set font for better display
 plt.rcParams['font.sans-serif'] = ['Arial', 'DejaVu Sans']
 plt.rcParams['axes.unicode_minus'] = False
 
 def load_sea_level_data():
-    """Load sea level data"""
+    """Load sea level data as (years, sea_levels) NumPy arrays"""
+    csv_path = 'HKO_QUB_SeaLevel_Data_20250918_163225.csv'
+    parquet_path = csv_path.replace('.csv', '.parquet')
     try:
-        df = pd.read_csv('HKO_QUB_SeaLevel_Data_20250918_163225.csv')
-        df = df.dropna(subset=['Mean_Sea_Level_m'])
-        return df
-    except FileNotFoundError:
-        print("Data file not found!")
+        # Parquet reads only the needed columns as native dtypes
+        df = pd.read_parquet(parquet_path, columns=['Year', 'Mean_Sea_Level_m'])
+    except (ImportError, OSError):
+        try:
+            df = pd.read_csv(csv_path)
+        except FileNotFoundError:
+            print("Data file not found!")
+            return None
+    df = df.dropna(subset=['Mean_Sea_Level_m'])
+    # Hand back just the two arrays the animation needs, without copying,
+    # so the full DataFrame is not kept alive
+    return (df['Year'].to_numpy(copy=False),
+            df['Mean_Sea_Level_m'].to_numpy(copy=False))
+
+def _setup_polar_animation():
+    """Build the polar figure and animate callback
+
+    Returns (fig, animate, total_frames), or None if no data is available.
+    Shared by the interactive chart and the off-screen MP4 export.
+    """
+    data = load_sea_level_data()
+    if data is None:
         return None
 
-def create_animated_polar_chart():
-    """Create animated polar chart"""
-    df = load_sea_level_data()
-    if df is None:
-        return
-    
-    years = df['Year'].values
-    sea_levels = df['Mean_Sea_Level_m'].values
+    years, sea_levels = data
     
     # Calculate angles based on 10-year cycles
-    # Each year's angle within its decade (0 to 2π)
-    angles = []
-    radii = []
-    
-    for year, level in zip(years, sea_levels):
-        year_in_decade = year % 10  # Position within decade (0-9)
-        angle = (year_in_decade / 10) * 2 * np.pi
-        angles.append(angle)
-        
-        # Radius = direct sea level height (scaled for better visibility)
-        # Scale from 1.28-1.51m to radius 1-5 for better visualization
-        min_level, max_level = sea_levels.min(), sea_levels.max()
-        radius = 1 + ((level - min_level) / (max_level - min_level)) * 4
-        radii.append(radius)
-    
-    angles = np.array(angles)
-    radii = np.array(radii)
+    # Each year's angle within its decade (0 to 2π), computed vectorized
+    # float32 is plenty of precision for plotting and halves bandwidth
+    angles = ((years % 10) / 10 * 2 * np.pi).astype(np.float32)
+
+    # Radius = direct sea level height (scaled for better visibility)
+    # Scale from 1.28-1.51m to radius 1-5 for better visualization
+    min_level, max_level = sea_levels.min(), sea_levels.max()
+    radii = (1 + (sea_levels - min_level) / (max_level - min_level) * 4).astype(np.float32)
+
+    # Precompute per-point attributes once; animate only slices prefix
+    # views of these buffers, so no per-frame allocation happens
+    colors_all = ((years - years[0]) / (years[-1] - years[0])).astype(np.float32)
+    # Run the colormap once up front; animate hands out RGBA views instead
+    # of making matplotlib re-map the growing prefix every frame
+    rgba_all = plt.cm.viridis(colors_all).astype(np.float32)
+    offsets_all = np.empty((len(years), 2), dtype=np.float32)
+    offsets_all[:, 0] = angles
+    offsets_all[:, 1] = radii
+
+    # Labels that stay visible once revealed: every 5 years plus endpoints
+    show_mask = (years % 5 == 0)
+    show_mask[0] = show_mask[-1] = True
+
+    # Decade and position-in-decade per point, for the info box
+    decades_all = (years // 10) * 10
+    year_in_decade_all = years % 10
     
     # Create figure
     fig, ax = plt.subplots(figsize=(14, 14), subplot_kw=dict(projection='polar'))
@@ -75,8 +95,14 @@ def create_animated_polar_chart():
     points = ax.scatter([], [], c=[], s=60, cmap='viridis', alpha=0.8, 
                        edgecolors='white', linewidth=1)
     
-    # Year label list
+    # Pre-create one year label per data point so the artist set stays
+    # constant; the animation only toggles their visibility (blit-friendly)
     year_texts = []
+    for i in range(len(years)):
+        text = ax.text(angles[i], radii[i] + 0.15, f'{years[i]}',
+                       ha='center', va='center', fontsize=8, visible=False,
+                       bbox=dict(boxstyle='round,pad=0.2', facecolor='white', alpha=0.7))
+        year_texts.append(text)
     
     # Add start and current point markers
     start_point, = ax.plot([], [], 'ro', markersize=10, label=f'Start ({years[0]})')
@@ -88,7 +114,15 @@ def create_animated_polar_chart():
                        facecolor='wheat', alpha=0.8))
     
     ax.legend(loc='center left', bbox_to_anchor=(1.25, 0.5))
-    
+
+    # Fixed artist list returned from every frame; the set never changes,
+    # only artist state does, which keeps the blit background valid
+    artists = [line, points, start_point, current_point, info_text] + year_texts
+
+    # Index of the point revealed by the previous frame, so each frame only
+    # touches the labels that actually changed
+    last_idx = [-1]
+
     def animate(frame):
         """Animation function"""
         if frame == 0:
@@ -97,58 +131,34 @@ def create_animated_polar_chart():
             current_point.set_data([], [])
             line.set_data([], [])
             points.set_offsets(np.empty((0, 2)))
-            
-            # Clear previous year labels
+
+            # Hide all year labels
             for text in year_texts:
-                text.remove()
-            year_texts.clear()
-            
-            info_text.set_text(f'Start Year: {years[0]}\nSea Level: {sea_levels[0]:.3f}m\nDecade: {int(years[0]//10)*10}s\nData Points: 1/{len(years)}')
-            
+                text.set_visible(False)
+            last_idx[0] = -1
+
+            info_text.set_text(f'Start Year: {years[0]}\nSea Level: {sea_levels[0]:.3f}m\nDecade: {decades_all[0]}s\nData Points: 1/{len(years)}')
+
         else:
             # Show connections from first point to current point
             current_idx = min(frame, len(years) - 1)
-            
-            # Update connections
-            line_angles = angles[:current_idx + 1]
-            line_radii = radii[:current_idx + 1]
-            line.set_data(line_angles, line_radii)
-            
-            # Update all displayed points
-            if current_idx >= 0:
-                # Create color mapping (based on time progression)
-                colors = []
-                for i in range(current_idx + 1):
-                    # Color based on year progression (0 to 1)
-                    color_val = (years[i] - years[0]) / (years[-1] - years[0])
-                    colors.append(color_val)
-                
-                offsets = np.column_stack([line_angles, line_radii])
-                points.set_offsets(offsets)
-                points.set_array(np.array(colors))
-            
-            # Clear previous year labels
-            for text in year_texts:
-                text.remove()
-            year_texts.clear()
-            
-            # Add year labels next to each point
-            for i in range(current_idx + 1):
-                # Calculate label position (slightly offset to avoid overlap)
-                label_angle = angles[i]
-                label_radius = radii[i] + 0.15
-                
-                # Convert to Cartesian coordinates for text placement
-                x = label_radius * np.cos(label_angle - np.pi/2)
-                y = label_radius * np.sin(label_angle - np.pi/2)
-                
-                # Only show labels every 5 years to avoid crowding
-                if i == 0 or i == current_idx or years[i] % 5 == 0:
-                    text = ax.text(label_angle, label_radius, f'{years[i]}', 
-                                 ha='center', va='center', fontsize=8, 
-                                 bbox=dict(boxstyle='round,pad=0.2', facecolor='white', alpha=0.7))
-                    year_texts.append(text)
-            
+
+            # Update connections and points with precomputed prefix views
+            line.set_data(angles[:current_idx + 1], radii[:current_idx + 1])
+            points.set_offsets(offsets_all[:current_idx + 1])
+            points.set_facecolors(rgba_all[:current_idx + 1])
+
+            # Only the newly revealed label changes between frames; the
+            # previous current-point label stays up only on 5-year marks
+            prev_idx = last_idx[0]
+            if prev_idx != current_idx:
+                if prev_idx >= 0:
+                    year_texts[prev_idx].set_visible(show_mask[prev_idx])
+                else:
+                    year_texts[0].set_visible(True)
+                year_texts[current_idx].set_visible(True)
+                last_idx[0] = current_idx
+
             # Update current point
             current_point.set_data([angles[current_idx]], [radii[current_idx]])
             
@@ -158,8 +168,8 @@ def create_animated_polar_chart():
             # Update info text
             current_year = years[current_idx]
             current_level = sea_levels[current_idx]
-            current_decade = int(current_year // 10) * 10
-            year_in_decade = current_year % 10
+            current_decade = decades_all[current_idx]
+            year_in_decade = year_in_decade_all[current_idx]
             progress = (current_idx + 1) / len(years) * 100
             
             info_text.set_text(
@@ -171,17 +181,11 @@ def create_animated_polar_chart():
                 f'Progress: {progress:.1f}%'
             )
         
-        return [line, points, start_point, current_point, info_text] + year_texts
-    
-    # Create animation
+        return artists
+
     # Total frames = data points + pause frames
     total_frames = len(years) + 60  # End pause 60 frames
-    
-    anim = animation.FuncAnimation(
-        fig, animate, frames=total_frames, interval=300,  # 300ms per frame, slower to see years clearly
-        blit=False, repeat=True
-    )
-    
+
     print(f"\nAnimation Info:")
     print(f"Data Range: {years[0]}-{years[-1]} ({len(years)} years)")
     print(f"Sea Level Range: {sea_levels.min():.3f}-{sea_levels.max():.3f}m")
@@ -190,9 +194,52 @@ def create_animated_polar_chart():
     print(f"Display Logic: 10-year cycles, angle=position in decade, radius=sea level height")
     print(f"Radius Range: 1.00-5.00 (scaled from {sea_levels.min():.3f}-{sea_levels.max():.3f}m)")
     print(f"Year Labels: Every 5 years + start and end points")
-    
+
+    return fig, animate, total_frames
+
+def create_animated_polar_chart():
+    """Create animated polar chart"""
+    built = _setup_polar_animation()
+    if built is None:
+        return
+    fig, animate, total_frames = built
+
+    anim = animation.FuncAnimation(
+        fig, animate, frames=total_frames, interval=300,  # 300ms per frame, slower to see years clearly
+        blit=True, repeat=True
+    )
+
     plt.show()
 
+def save_mp4(path, fps=10):
+    """Render the animation off-screen with Agg and pipe frames to ffmpeg"""
+    import subprocess
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    built = _setup_polar_animation()
+    if built is None:
+        return
+    fig, animate, total_frames = built
+
+    # Draw straight onto an Agg canvas; no GUI event loop or per-frame
+    # temporary files are involved
+    canvas = FigureCanvasAgg(fig)
+    canvas.draw()
+    width, height = canvas.get_width_height(physical=True)
+
+    proc = subprocess.Popen(
+        ['ffmpeg', '-y', '-f', 'rawvideo', '-pix_fmt', 'rgba',
+         '-s', f'{width}x{height}', '-r', str(fps), '-i', '-',
+         '-an', '-vcodec', 'libx264', '-pix_fmt', 'yuv420p', path],
+        stdin=subprocess.PIPE)
+    for frame in range(total_frames):
+        animate(frame)
+        canvas.draw()
+        proc.stdin.write(canvas.buffer_rgba())
+    proc.stdin.close()
+    proc.wait()
+    print(f"✓ Animation saved: {path}")
+
 if __name__ == "__main__":
     print("Creating sea level animation...")
     print("Animation effect: 10-year cycles, angle=year in decade, radius=sea level height")
@@ -0,0 +1,66 @@
+import numpy as np
+from vispy import app, scene
+
+from polarCoordVisualization import load_sea_level_data
+
+def create_vispy_polar_chart():
+    """Create GPU-accelerated polar chart animation using VisPy"""
+    data = load_sea_level_data()
+    if data is None:
+        return
+
+    years, sea_levels = data
+    n = len(years)
+
+    # Same polar layout as the matplotlib version: angle = position in
+    # decade, radius = scaled sea level height
+    angles = (years % 10) / 10 * 2 * np.pi
+    min_level, max_level = sea_levels.min(), sea_levels.max()
+    radii = 1 + (sea_levels - min_level) / (max_level - min_level) * 4
+
+    # Convert to cartesian once on the CPU; the GPU buffer is uploaded
+    # a single time and frames only change how many points are drawn
+    positions = np.empty((n, 2), dtype=np.float32)
+    positions[:, 0] = radii * np.cos(angles - np.pi / 2)
+    positions[:, 1] = radii * np.sin(angles - np.pi / 2)
+
+    # Progression colors (dark to bright with time)
+    t = ((years - years[0]) / (years[-1] - years[0])).astype(np.float32)
+    colors = np.column_stack([t, 1 - t * 0.5, np.full(n, 0.8, np.float32),
+                              np.full(n, 0.9, np.float32)])
+
+    canvas = scene.SceneCanvas(title='Hong Kong Sea Level (VisPy)',
+                               size=(900, 900), keys='interactive', show=True)
+    view = canvas.central_widget.add_view()
+    view.camera = scene.PanZoomCamera(rect=(-6, -6, 12, 12), aspect=1)
+
+    line = scene.visuals.Line(pos=positions[:1], color=(0.2, 0.4, 1.0, 0.7),
+                              width=2, parent=view.scene)
+    markers = scene.visuals.Markers(parent=view.scene)
+    markers.set_data(positions[:1], face_color=colors[:1],
+                     edge_color='white', size=10)
+
+    state = {'frame': 0}
+
+    def on_timer(event):
+        """Advance the animation by one point per tick"""
+        k = min(state['frame'], n - 1) + 1
+        # Slices are views into the precomputed buffers - no per-frame
+        # conversion work, the GPU just draws k points
+        line.set_data(pos=positions[:k])
+        markers.set_data(positions[:k], face_color=colors[:k],
+                         edge_color='white', size=10)
+        state['frame'] = (state['frame'] + 1) % (n + 60)  # end pause
+
+    timer = app.Timer(interval=0.3, connect=on_timer, start=True)
+
+    print(f"\nVisPy Animation Info:")
+    print(f"Data Range: {years[0]}-{years[-1]} ({n} years)")
+    print(f"Sea Level Range: {sea_levels.min():.3f}-{sea_levels.max():.3f}m")
+    print(f"Display Logic: 10-year cycles, angle=position in decade, radius=sea level height")
+
+    app.run()
+
+if __name__ == "__main__":
+    print("Creating sea level animation (VisPy backend)...")
+    create_vispy_polar_chart()